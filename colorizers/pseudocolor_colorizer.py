@@ -5,40 +5,152 @@ This module implements intensity-based colormap mapping for colorization.
 Supports multiple colormap modes: Jet, Hot, Cool, Viridis, Parula, etc.
 """
 
+import functools
+
 import numpy as np
-from matplotlib import cm
-from skimage import color
+
+from .hsv_colorizer import _rgb2gray_fast
 
 
-# Available colormap modes
+# Available colormap modes, mapped to matplotlib colormap names.
+# Resolved lazily in _get_lut so importing this module does not pay for
+# importing matplotlib.
 COLORMAP_MODES = {
-    'jet': cm.jet,
-    'hot': cm.hot,
-    'cool': cm.cool,
-    'viridis': cm.viridis,
-    'parula': cm.viridis,  # Parula is similar to viridis, using viridis as substitute
-    'plasma': cm.plasma,
-    'inferno': cm.inferno,
-    'magma': cm.magma,
-    'spring': cm.spring,
-    'summer': cm.summer,
-    'autumn': cm.autumn,
-    'winter': cm.winter,
-    'rainbow': cm.rainbow,
-    'turbo': cm.turbo,
-    'hsv': cm.hsv,
-    'seismic': cm.seismic,
-    'terrain': cm.terrain,
+    'jet': 'jet',
+    'hot': 'hot',
+    'cool': 'cool',
+    'viridis': 'viridis',
+    'parula': 'viridis',  # Parula is similar to viridis, using viridis as substitute
+    'plasma': 'plasma',
+    'inferno': 'inferno',
+    'magma': 'magma',
+    'spring': 'spring',
+    'summer': 'summer',
+    'autumn': 'autumn',
+    'winter': 'winter',
+    'rainbow': 'rainbow',
+    'turbo': 'turbo',
+    'hsv': 'hsv',
+    'seismic': 'seismic',
+    'terrain': 'terrain',
 }
 
 
+@functools.lru_cache(maxsize=None)
+def _get_lut(cmap_name):
+    """
+    Build the uint8 (256, 3) lookup table for a matplotlib colormap.
+
+    Calling a matplotlib colormap on a float array renormalizes,
+    quantizes to 256 bins and returns a float64 RGBA image (32
+    bytes/pixel); indexing a 768-byte LUT that fits in L1 with a uint8
+    intensity index does the same mapping in a single gather. matplotlib
+    itself is imported here, on first use, so module import stays cheap;
+    the cache makes every later call a dict hit.
+    """
+    from matplotlib import cm
+
+    cmap = getattr(cm, cmap_name)
+    return (cmap(np.linspace(0, 1, 256))[:, :3] * 255).astype(np.uint8)
+
+
+def _prep_u8_index(img_rgb):
+    """
+    Reduce an input image to the uint8 intensity index used to gather
+    from the colormap LUTs.
+
+    uint8 inputs stay in integer arithmetic (weighted luminance sum for
+    RGB, identity for grayscale); other dtypes go through the float32
+    normalize-and-quantize path.
+
+    Args:
+        img_rgb: Input image as RGB numpy array (H, W, 3) or grayscale
+                 (H, W); integer dtypes hold values in [0, 255], float
+                 dtypes must already be normalized to [0, 1]
+
+    Returns:
+        Index array as uint8 numpy array (H, W) with values in [0, 255]
+    """
+    if img_rgb.dtype == np.uint8:
+        if img_rgb.ndim == 3:
+            # Luminance coefficients scaled by 256 (54 + 183 + 18 = 255),
+            # so the weighted sum fits in uint16 without overflow
+            coeffs = np.array([54, 183, 18], dtype=np.uint16)
+            return ((img_rgb.astype(np.uint16) @ coeffs) >> 8).astype(np.uint8)
+        return img_rgb
+
+    # Integer dtypes hold [0, 255]; float inputs are assumed already
+    # normalized. The dtype check is O(1), unlike a full max() scan
+    # asarray returns float32 input unchanged, where astype always copies
+    if np.issubdtype(img_rgb.dtype, np.integer):
+        img_rgb_normalized = np.multiply(
+            np.asarray(img_rgb, dtype=np.float32), np.float32(1.0 / 255.0))
+    else:
+        img_rgb_normalized = np.asarray(img_rgb, dtype=np.float32)
+
+    # Convert to grayscale if needed
+    if img_rgb_normalized.ndim == 3:
+        img_gray = _rgb2gray_fast(img_rgb_normalized)
+    else:
+        # no copy needed: downstream only reads img_gray
+        img_gray = img_rgb_normalized
+
+    # Quantize intensity to a uint8 index. This clip is not defensive:
+    # float inputs may legitimately fall outside [0, 1] and casting an
+    # out-of-range float to uint8 wraps, so clamp like the colormap would
+    return np.clip(img_gray * 255, 0, 255).astype(np.uint8)
+
+
+def prepare_gray(img_rgb):
+    """
+    Compute the grayscale representations shared by the colorizers once.
+
+    Callers that apply several colorizers to the same image (e.g.
+    main.py) should call this once and hand the results to
+    colorize_pseudocolor_from_u8 / colorize_hsv_from_gray instead of
+    letting each colorizer redo the normalize+rgb2gray work.
+
+    Args:
+        img_rgb: Input image as RGB numpy array (H, W, 3) or grayscale
+                 (H, W); integer dtypes hold values in [0, 255], float
+                 dtypes must already be normalized to [0, 1]
+
+    Returns:
+        Tuple (gray_u8, gray_f32): the uint8 intensity index in [0, 255]
+        and the float32 grayscale in [0, 1], both of shape (H, W)
+    """
+    gray_u8 = _prep_u8_index(img_rgb)
+    gray_f32 = gray_u8.astype(np.float32) * np.float32(1.0 / 255.0)
+    return gray_u8, gray_f32
+
+
+def colorize_pseudocolor_from_u8(gray_u8, colormap_mode='jet'):
+    """
+    Apply a pseudocolor mapping to a prepared uint8 intensity index.
+
+    Args:
+        gray_u8: Intensity index as uint8 numpy array (H, W) in [0, 255]
+        colormap_mode: String specifying the colormap to use (see
+                       colorize_pseudocolor)
+
+    Returns:
+        Colorized RGB image as uint8 numpy array (H, W, 3) with values in [0, 255]
+    """
+    if colormap_mode.lower() not in COLORMAP_MODES:
+        print(f"Warning: Unknown colormap '{colormap_mode}', using 'jet' instead.")
+        colormap_mode = 'jet'
+
+    return _get_lut(COLORMAP_MODES[colormap_mode.lower()])[gray_u8]
+
+
 def colorize_pseudocolor(img_rgb, colormap_mode='jet'):
     """
     Colorize a grayscale or RGB image using pseudocolor mapping.
     
     Args:
-        img_rgb: Input image as RGB numpy array (H, W, 3) with values in [0, 255]
-                 or grayscale (H, W) with values in [0, 255]
+        img_rgb: Input image as RGB numpy array (H, W, 3) or grayscale
+                 (H, W); integer dtypes hold values in [0, 255], float
+                 dtypes must already be normalized to [0, 1]
         colormap_mode: String specifying the colormap to use.
                       Options: 'jet', 'hot', 'cool', 'viridis', 'parula', 
                                'plasma', 'inferno', 'magma', 'spring', 'summer',
@@ -47,35 +159,9 @@ def colorize_pseudocolor(img_rgb, colormap_mode='jet'):
                       Default: 'jet'
     
     Returns:
-        Colorized RGB image as numpy array (H, W, 3) with values in [0, 1]
+        Colorized RGB image as uint8 numpy array (H, W, 3) with values in [0, 255]
     """
-    # Normalize input to [0, 1] range if needed
-    if img_rgb.max() > 1.0:
-        img_rgb_normalized = img_rgb.astype(np.float32) / 255.0
-    else:
-        img_rgb_normalized = img_rgb.astype(np.float32)
-    
-    # Convert to grayscale if needed
-    if img_rgb_normalized.ndim == 3:
-        img_gray = color.rgb2gray(img_rgb_normalized)
-    else:
-        img_gray = img_rgb_normalized.copy()
-    
-    # Get colormap
-    if colormap_mode.lower() not in COLORMAP_MODES:
-        print(f"Warning: Unknown colormap '{colormap_mode}', using 'jet' instead.")
-        colormap_mode = 'jet'
-    
-    colormap = COLORMAP_MODES[colormap_mode.lower()]
-    
-    # Apply colormap: map intensity [0, 1] to RGB colors
-    # colormap returns RGBA, we only need RGB
-    img_colored = colormap(img_gray)[:, :, :3]
-    
-    # Ensure values are in [0, 1] range
-    img_colored = np.clip(img_colored, 0, 1)
-    
-    return img_colored
+    return colorize_pseudocolor_from_u8(_prep_u8_index(img_rgb), colormap_mode)
 
 
 def colorize_pseudocolor_multiple(img_rgb, colormap_modes=None):
@@ -83,19 +169,25 @@ def colorize_pseudocolor_multiple(img_rgb, colormap_modes=None):
     Apply multiple pseudocolor mappings to an image.
     
     Args:
-        img_rgb: Input image as RGB numpy array (H, W, 3) with values in [0, 255]
+        img_rgb: Input image as RGB numpy array (H, W, 3); integer dtypes
+                 hold values in [0, 255], float dtypes must already be
+                 normalized to [0, 1]
         colormap_modes: List of colormap mode strings. If None, uses default set.
     
     Returns:
-        Dictionary mapping colormap names to colorized images (all in [0, 1] range)
+        Dictionary mapping colormap names to colorized uint8 images in [0, 255]
     """
     if colormap_modes is None:
         colormap_modes = ['jet', 'hot', 'viridis', 'plasma']
-    
+
+    # Compute the grayscale index once; per colormap, the remaining work
+    # is a single LUT gather
+    idx = _prep_u8_index(img_rgb)
+
     results = {}
     for mode in colormap_modes:
-        results[mode] = colorize_pseudocolor(img_rgb, mode)
-    
+        results[mode] = colorize_pseudocolor_from_u8(idx, mode)
+
     return results
 
 
@@ -1,5 +1,7 @@
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+
 import matplotlib.pyplot as plt
 
 from colorizers import *
@@ -16,22 +18,77 @@ colorizer_siggraph17 = siggraph17(pretrained=True).eval()
 if(opt.use_gpu):
 	colorizer_eccv16.cuda()
 	colorizer_siggraph17.cuda()
+# NHWC layout lets conv kernels skip the internal transposes
+colorizer_eccv16 = colorizer_eccv16.to(memory_format=torch.channels_last)
+colorizer_siggraph17 = colorizer_siggraph17.to(memory_format=torch.channels_last)
 
 # default size to process images is 256x256
 # grab L channel in both original ("orig") and resized ("rs") resolutions
 img = load_img(opt.img_path)
 (tens_l_orig, tens_l_rs) = preprocess_img(img, HW=(256,256))
 if(opt.use_gpu):
-	tens_l_rs = tens_l_rs.cuda()
+	# pinned host memory lets the H2D copy overlap with the CPU colorizers
+	tens_l_rs = tens_l_rs.pin_memory().cuda(non_blocking=True)
+tens_l_rs = tens_l_rs.to(memory_format=torch.channels_last)
+
+# the inference shape is fixed at (1,1,256,256), so trace both models to
+# specialized graphs: per-op Python dispatch disappears and
+# optimize_for_inference folds conv+bn and freezes the weights
+with torch.no_grad():
+	colorizer_eccv16 = torch.jit.optimize_for_inference(
+		torch.jit.trace(colorizer_eccv16, tens_l_rs))
+	colorizer_siggraph17 = torch.jit.optimize_for_inference(
+		torch.jit.trace(colorizer_siggraph17, tens_l_rs))
+
+# one CUDA stream per model lets the two forward passes (and their D2H
+# copies) overlap on the device instead of serializing on the default stream
+if(opt.use_gpu):
+	streams = (torch.cuda.Stream(), torch.cuda.Stream())
+else:
+	streams = (None, None)
+
+def run_inference(colorizer, stream):
+	with torch.inference_mode():
+		if(opt.use_gpu):
+			# order after the default stream (current here) so the H2D
+			# copy of tens_l_rs is complete before this stream reads it
+			stream.wait_stream(torch.cuda.current_stream())
+			with torch.cuda.stream(stream):
+				# FP16 halves the memory traffic of the conv stacks on GPU;
+				# cast back to float before the numpy postprocess
+				with torch.autocast('cuda', dtype=torch.float16):
+					out_ab = colorizer(tens_l_rs)
+				out_ab = out_ab.float()
+				# copy into pinned host memory so the D2H transfer also
+				# pipelines with the other stream's kernels
+				out_host = torch.empty_like(out_ab, device='cpu', pin_memory=True)
+				out_host.copy_(out_ab, non_blocking=True)
+			stream.synchronize()
+			return out_host
+		return colorizer(tens_l_rs).cpu()
 
 # colorizer outputs 256x256 ab map
 # resize and concatenate to original L channel
-img_bw = postprocess_tens(tens_l_orig, torch.cat((0*tens_l_orig,0*tens_l_orig),dim=1))
-out_img_eccv16 = postprocess_tens(tens_l_orig, colorizer_eccv16(tens_l_rs).cpu())
-out_img_siggraph17 = postprocess_tens(tens_l_orig, colorizer_siggraph17(tens_l_rs).cpu())
-out_img_hsv = colorize_hsv(img)
-out_img_pseudocolor_jet = colorize_pseudocolor(img, colormap_mode='jet')
-out_img_pseudocolor_viridis = colorize_pseudocolor(img, colormap_mode='viridis')
+# the two network inferences and the CPU colorizers are independent,
+# so run them concurrently instead of serially; the HSV and pseudocolor
+# colorizers share one grayscale conversion of the input
+gray_u8, gray_f32 = prepare_gray(img)
+with ThreadPoolExecutor(max_workers=4) as pool:
+	fut_eccv16 = pool.submit(run_inference, colorizer_eccv16, streams[0])
+	fut_siggraph17 = pool.submit(run_inference, colorizer_siggraph17, streams[1])
+	fut_jet = pool.submit(colorize_pseudocolor_from_u8, gray_u8, 'jet')
+	fut_viridis = pool.submit(colorize_pseudocolor_from_u8, gray_u8, 'viridis')
+
+	# keep the HSV colorizer on the main thread: its numba kernel is
+	# already multicore, and first-compiling it from a pool worker hangs
+	# interpreter exit with the default workqueue threading layer
+	out_img_hsv = colorize_hsv_from_gray(gray_f32)
+
+	img_bw = postprocess_tens(tens_l_orig, torch.cat((0*tens_l_orig,0*tens_l_orig),dim=1))
+	out_img_eccv16 = postprocess_tens(tens_l_orig, fut_eccv16.result())
+	out_img_siggraph17 = postprocess_tens(tens_l_orig, fut_siggraph17.result())
+	out_img_pseudocolor_jet = fut_jet.result()
+	out_img_pseudocolor_viridis = fut_viridis.result()
 
 
 
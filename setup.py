@@ -0,0 +1,29 @@
+"""
+Optional build for the SIMD grayscale extension.
+
+Run `python setup.py build_ext --inplace` to compile
+colorizers/_simd.c with AVX2/FMA enabled. The colorizers work without
+it; they fall back to the NumPy matmul path when the extension is
+missing.
+"""
+
+import platform
+
+from setuptools import Extension, setup
+
+if platform.machine() in ('x86_64', 'AMD64'):
+    extra_compile_args = ['-O3', '-mavx2', '-mfma']
+else:
+    extra_compile_args = ['-O3']
+
+setup(
+    name='ImageColorizer',
+    packages=['colorizers'],
+    ext_modules=[
+        Extension(
+            'colorizers._simd',
+            sources=['colorizers/_simd.c'],
+            extra_compile_args=extra_compile_args,
+        ),
+    ],
+)